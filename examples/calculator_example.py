@@ -12,21 +12,17 @@ async def main():
         info = await client.get_info()
         print(f"Connected to: {info.name}")
         
-        # Call the sum tool
-        result = await client.call_tool("sum", {"a": 5, "b": 3})
-        print(f"5 + 3 = {result}")
-        
-        # Call the sub tool
-        result = await client.call_tool("sub", {"a": 10, "b": 4})
-        print(f"10 - 4 = {result}")
-        
-        # Call the multiply tool
-        result = await client.call_tool("multiply", {"a": 6, "b": 7})
-        print(f"6 * 7 = {result}")
-        
-        # Call the divide tool
-        result = await client.call_tool("divide", {"a": 20, "b": 4})
-        print(f"20 / 4 = {result}")
+        # The calls are independent, so send them concurrently over the one session
+        sum_result, sub_result, multiply_result, divide_result = await asyncio.gather(
+            client.call_tool("sum", {"a": 5, "b": 3}),
+            client.call_tool("sub", {"a": 10, "b": 4}),
+            client.call_tool("multiply", {"a": 6, "b": 7}),
+            client.call_tool("divide", {"a": 20, "b": 4}),
+        )
+        print(f"5 + 3 = {sum_result}")
+        print(f"10 - 4 = {sub_result}")
+        print(f"6 * 7 = {multiply_result}")
+        print(f"20 / 4 = {divide_result}")
         
         # Try division by zero (should raise an error)
         try:
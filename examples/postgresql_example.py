@@ -5,6 +5,17 @@ import sys
 from fastmcp import Client
 import json
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def to_json(value):
+    """Pretty-print a tool result, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(value, indent=2)
+
 async def main():
     if len(sys.argv) < 2:
         print("Usage: python postgresql_example.py <connection_string>")
@@ -23,27 +34,30 @@ async def main():
         # List tables
         print("\nListing tables:")
         result = await client.call_tool("list_tables")
-        print(json.dumps(result, indent=2))
+        print(to_json(result))
         
         # If there are tables, get schema for the first one
         if result.get("tables") and len(result["tables"]) > 0:
             table_name = result["tables"][0]
             
-            # Get table schema
+            query = f"SELECT * FROM {table_name} LIMIT 5"
+            
+            # Schema, row count and sample rows only need the table name,
+            # so request them concurrently
+            schema, count, query_result = await asyncio.gather(
+                client.call_tool("get_table_schema", {"table_name": table_name}),
+                client.call_tool("count_rows", {"table_name": table_name}),
+                client.call_tool("execute_query", {"query": query}),
+            )
+            
             print(f"\nGetting schema for table: {table_name}")
-            schema = await client.call_tool("get_table_schema", {"table_name": table_name})
-            print(json.dumps(schema, indent=2))
+            print(to_json(schema))
             
-            # Count rows in the table
             print(f"\nCounting rows in table: {table_name}")
-            count = await client.call_tool("count_rows", {"table_name": table_name})
-            print(json.dumps(count, indent=2))
+            print(to_json(count))
             
-            # Execute a simple query
             print(f"\nExecuting query on table: {table_name}")
-            query = f"SELECT * FROM {table_name} LIMIT 5"
-            query_result = await client.call_tool("execute_query", {"query": query})
-            print(json.dumps(query_result, indent=2))
+            print(to_json(query_result))
 
 if __name__ == "__main__":
     asyncio.run(main())
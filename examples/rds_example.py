@@ -4,6 +4,17 @@ import asyncio
 from fastmcp import Client
 import json
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def to_json(value):
+    """Pretty-print a tool result, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(value, indent=2)
+
 async def main():
     # Create a client that points to the RDS server
     client = Client("../src/rds_server.py")
@@ -16,21 +27,26 @@ async def main():
         # List RDS instances
         print("\nListing RDS instances:")
         result = await client.call_tool("list_db_instances")
-        print(json.dumps(result, indent=2))
+        print(to_json(result))
         
         # If there are instances, get details for the first one
         if result.get("instances") and len(result["instances"]) > 0:
             instance_id = result["instances"][0]["identifier"]
             
-            # Get detailed information about the instance
+            # Instance details and engine versions are independent, so request them concurrently
+            details, versions = await asyncio.gather(
+                client.call_tool("describe_db_instance", {"instance_id": instance_id}),
+                client.call_tool("list_db_engine_versions", {"engine": "mysql"}),
+            )
+            
             print(f"\nGetting details for RDS instance: {instance_id}")
-            details = await client.call_tool("describe_db_instance", {"instance_id": instance_id})
-            print(json.dumps(details, indent=2))
+            print(to_json(details))
+        else:
+            versions = await client.call_tool("list_db_engine_versions", {"engine": "mysql"})
         
         # List engine versions for MySQL
         print("\nListing MySQL engine versions:")
-        versions = await client.call_tool("list_db_engine_versions", {"engine": "mysql"})
-        print(json.dumps(versions, indent=2))
+        print(to_json(versions))
 
 if __name__ == "__main__":
     asyncio.run(main())
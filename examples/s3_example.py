@@ -4,6 +4,17 @@ import asyncio
 from fastmcp import Client
 import json
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def to_json(value):
+    """Pretty-print a tool result, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(value, indent=2)
+
 async def main():
     # Create a client that points to the S3 server
     client = Client("../src/s3_server.py")
@@ -16,21 +27,16 @@ async def main():
         # List buckets
         print("\nListing S3 buckets:")
         result = await client.call_tool("list_buckets")
-        print(json.dumps(result, indent=2))
+        print(to_json(result))
         
         # If there are buckets, get details for the first one
         if result.get("buckets") and len(result["buckets"]) > 0:
             bucket_name = result["buckets"][0]
             
-            # Get bucket location
-            print(f"\nGetting location for bucket: {bucket_name}")
-            location = await client.call_tool("get_bucket_location", {"bucket": bucket_name})
-            print(json.dumps(location, indent=2))
-            
-            # List objects in the bucket
+            # One call resolves the bucket's region and lists its objects there
             print(f"\nListing objects in bucket: {bucket_name}")
-            objects = await client.call_tool("list_objects", {"bucket": bucket_name})
-            print(json.dumps(objects, indent=2))
+            objects = await client.call_tool("list_objects_smart", {"bucket": bucket_name})
+            print(to_json(objects))
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -6,35 +6,29 @@ from pydantic import Field
 
 mcp = FastMCP("Calculator Server")
 
+# Shared parameter types, reused across the tools below
+IntA = Annotated[int, Field(description="The first number")]
+IntB = Annotated[int, Field(description="The second number")]
+FloatA = Annotated[float, Field(description="The dividend")]
+FloatB = Annotated[float, Field(description="The divisor")]
+
 @mcp.tool()
-def sum(
-    a: Annotated[int, Field(description="The first number")],
-    b: Annotated[int, Field(description="The second number")]
-) -> int:
+def sum(a: IntA, b: IntB) -> int:
     """Calculate the sum of two numbers"""
     return a + b
 
 @mcp.tool()
-def sub(
-    a: Annotated[int, Field(description="The first number")],
-    b: Annotated[int, Field(description="The second number")]
-) -> int:
+def sub(a: IntA, b: IntB) -> int:
     """Calculate the difference between two numbers"""
     return a - b
 
 @mcp.tool()
-def multiply(
-    a: Annotated[int, Field(description="The first number")],
-    b: Annotated[int, Field(description="The second number")]
-) -> int:
+def multiply(a: IntA, b: IntB) -> int:
     """Calculate the product of two numbers"""
     return a * b
 
 @mcp.tool()
-def divide(
-    a: Annotated[float, Field(description="The dividend")],
-    b: Annotated[float, Field(description="The divisor")]
-) -> float:
+def divide(a: FloatA, b: FloatB) -> float:
     """Calculate the quotient of two numbers"""
     if b == 0:
         raise ValueError("Cannot divide by zero")
@@ -2,7 +2,7 @@
 # SPDX-License-Identifier: MIT-0
 import asyncio
 import asyncpg
-import json
+import re
 import sys
 from fastmcp import FastMCP
 from typing import Annotated, List, Dict, Any, Optional
@@ -18,59 +18,129 @@ logger = logging.getLogger("PostgreSQLServer")
 
 mcp = FastMCP("PostgreSQL Server")
 
+# Metadata queries; asyncpg caches their prepared statements per connection
+LIST_TABLES_SQL = """
+SELECT table_name 
+FROM information_schema.tables 
+WHERE table_schema = 'public'
+"""
+
+# Columns of a table, with the primary-key position of each key column
+GET_SCHEMA_SQL = """
+SELECT 
+    c.column_name, 
+    c.data_type,
+    c.is_nullable,
+    c.column_default,
+    pk.ordinal_position AS pk_position
+FROM 
+    information_schema.columns c
+    LEFT JOIN (
+        SELECT 
+            kcu.column_name,
+            kcu.ordinal_position
+        FROM 
+            information_schema.table_constraints tc
+            JOIN information_schema.key_column_usage kcu
+                ON tc.constraint_name = kcu.constraint_name AND
+                   tc.table_schema = kcu.table_schema
+        WHERE 
+            tc.constraint_type = 'PRIMARY KEY' AND
+            tc.table_schema = 'public' AND
+            tc.table_name = $1
+    ) pk ON pk.column_name = c.column_name
+WHERE 
+    c.table_schema = 'public' AND 
+    c.table_name = $1
+ORDER BY 
+    c.ordinal_position
+"""
+
+def _decode_point(value: str) -> Dict[str, float]:
+    """Decode a point from its text form, e.g. '(1.5,2)'"""
+    x, y = value.strip('()').split(',')
+    return {"x": float(x), "y": float(y)}
+
+def _encode_point(value: Dict[str, float]) -> str:
+    """Encode a {"x": ..., "y": ...} dict as point text"""
+    return f"({value['x']},{value['y']})"
+
+async def _init_connection(conn: asyncpg.Connection):
+    """Set up each new pooled connection once"""
+    # Decode PostgreSQL-specific types straight into JSON-friendly Python types
+    await conn.set_type_codec(
+        'uuid', encoder=str, decoder=str, schema='pg_catalog', format='text'
+    )
+    await conn.set_type_codec(
+        'numeric', encoder=str, decoder=float, schema='pg_catalog', format='text'
+    )
+    await conn.set_type_codec(
+        'point', encoder=_encode_point, decoder=_decode_point,
+        schema='pg_catalog', format='text'
+    )
+
 class PostgresOperator:
     def __init__(self, connection_string: str):
         self.connection_string = connection_string
-        self.conn = None
+        self.pool = None
         logger.info("PostgreSQL Operator initialized")
     
+    async def start(self):
+        """Create the connection pool shared by all tool calls"""
+        if not self.pool:
+            logger.info("Creating PostgreSQL connection pool")
+            self.pool = await asyncpg.create_pool(
+                self.connection_string,
+                min_size=10,
+                max_size=50,
+                command_timeout=60,
+                max_inactive_connection_lifetime=300,
+                init=_init_connection
+            )
+        return self.pool
+    
     async def connect(self):
-        """Connect to the PostgreSQL database"""
-        if not self.conn:
-            logger.info("Connecting to PostgreSQL database")
-            self.conn = await asyncpg.connect(self.connection_string)
-        return self.conn
+        """Return the connection pool, creating it if needed"""
+        return await self.start()
     
     async def close(self):
-        """Close the database connection"""
-        if self.conn:
-            logger.info("Closing PostgreSQL connection")
-            await self.conn.close()
-            self.conn = None
+        """Close the connection pool"""
+        if self.pool:
+            logger.info("Closing PostgreSQL connection pool")
+            await self.pool.close()
+            self.pool = None
 
 # The PostgreSQL operator will be initialized when the server starts
 postgres_operator = None
 
-# Custom JSON encoder for PostgreSQL types
-def _encoder(value):
-    if isinstance(value, asyncpg.pgproto.pgproto.UUID):
-        return str(value)
-    if isinstance(value, asyncpg.pgproto.pgproto.Numeric):
-        return float(value)
-    if isinstance(value, asyncpg.pgproto.pgproto.Point):
-        return {"x": float(value.x), "y": float(value.y)}
-    raise TypeError(f"Cannot encode {type(value)}")
+# Statements that modify data or schema, plus server functions that write or
+# administer, matched in one pass. This is only a fast pre-filter; queries also
+# run in read-only transactions, which is the real guard.
+_WRITE_RE = re.compile(
+    r'\b(?:insert|update|delete|drop|alter|create|truncate|grant|revoke'
+    r'|pg_(?:create|drop)_\w+|pg_terminate_backend|pg_cancel_backend|pg_reload_conf'
+    r'|pg_switch_wal|lo_(?:creat|create|import|export|unlink|put|from_bytea))\b',
+    re.IGNORECASE
+)
+
+# Number of rows pulled from the server per cursor fetch in execute_query
+FETCH_BATCH_SIZE = 1000
 
 @mcp.tool()
 async def list_tables() -> Dict[str, List[str]]:
     """List all tables in the connected database"""
-    if not postgres_operator:
+    if not postgres_operator or not postgres_operator.pool:
         return {"error": "Database connection not initialized"}
     
     try:
-        conn = await postgres_operator.connect()
-        query = """
-        SELECT table_name 
-        FROM information_schema.tables 
-        WHERE table_schema = 'public'
-        """
-        rows = await conn.fetch(query)
+        async with postgres_operator.pool.acquire() as conn:
+            rows = await conn.fetch(LIST_TABLES_SQL)
         tables = [row['table_name'] for row in rows]
         
-        logger.info(f"Listed {len(tables)} tables")
+        logger.info("Listed %d tables", len(tables))
         return {"tables": tables}
     except Exception as e:
-        logger.error(f"Error listing tables: {str(e)}")
+        logger.exception("Error listing tables")
         return {"error": str(e)}
 
 @mcp.tool()
@@ -78,26 +148,12 @@ async def get_table_schema(
     table_name: Annotated[str, Field(description="Name of the table")]
 ) -> Dict[str, Any]:
     """Get the schema information for a specific table"""
-    if not postgres_operator:
+    if not postgres_operator or not postgres_operator.pool:
         return {"error": "Database connection not initialized"}
     
     try:
-        conn = await postgres_operator.connect()
-        query = """
-        SELECT 
-            column_name, 
-            data_type,
-            is_nullable,
-            column_default
-        FROM 
-            information_schema.columns
-        WHERE 
-            table_schema = 'public' AND 
-            table_name = $1
-        ORDER BY 
-            ordinal_position
-        """
-        rows = await conn.fetch(query, table_name)
+        async with postgres_operator.pool.acquire() as conn:
+            rows = await conn.fetch(GET_SCHEMA_SQL, table_name)
         
         if not rows:
             return {"error": f"Table '{table_name}' not found"}
@@ -111,32 +167,21 @@ async def get_table_schema(
                 "default": row['column_default']
             })
         
-        # Get primary key information
-        pk_query = """
-        SELECT 
-            kcu.column_name
-        FROM 
-            information_schema.table_constraints tc
-            JOIN information_schema.key_column_usage kcu
-                ON tc.constraint_name = kcu.constraint_name
-        WHERE 
-            tc.constraint_type = 'PRIMARY KEY' AND
-            tc.table_schema = 'public' AND
-            tc.table_name = $1
-        ORDER BY 
-            kcu.ordinal_position
-        """
-        pk_rows = await conn.fetch(pk_query, table_name)
+        # Primary key columns, in key order
+        pk_rows = sorted(
+            (row for row in rows if row['pk_position'] is not None),
+            key=lambda row: row['pk_position']
+        )
         primary_keys = [row['column_name'] for row in pk_rows]
         
-        logger.info(f"Retrieved schema for table {table_name}")
+        logger.info("Retrieved schema for table %s", table_name)
         return {
             "table": table_name,
             "columns": columns,
             "primary_keys": primary_keys
         }
     except Exception as e:
-        logger.error(f"Error getting schema for table {table_name}: {str(e)}")
+        logger.exception("Error getting schema for table %s", table_name)
         return {"error": str(e)}
 
 @mcp.tool()
@@ -144,31 +189,35 @@ async def execute_query(
     query: Annotated[str, Field(description="SQL query to execute (read-only)")]
 ) -> Dict[str, Any]:
     """Execute a read-only SQL query"""
-    if not postgres_operator:
+    if not postgres_operator or not postgres_operator.pool:
         return {"error": "Database connection not initialized"}
     
     # For security, ensure this is a read-only query
-    query_lower = query.lower().strip()
-    if any(keyword in query_lower for keyword in ['insert', 'update', 'delete', 'drop', 'alter', 'create', 'truncate']):
-        logger.warning(f"Rejected non-read-only query: {query}")
+    if _WRITE_RE.search(query):
+        logger.warning("Rejected non-read-only query: %s", query)
         return {"error": "Only read-only queries are allowed"}
     
     try:
-        conn = await postgres_operator.connect()
-        rows = await conn.fetch(query)
-        
-        # Convert rows to dictionaries and handle PostgreSQL-specific types
         result = []
-        for row in rows:
-            row_dict = dict(row)
-            # Use json to handle PostgreSQL types
-            row_json = json.loads(json.dumps(row_dict, default=_encoder))
-            result.append(row_json)
+        async with postgres_operator.pool.acquire() as conn:
+            # Cursors require a transaction; stream the rows in batches so
+            # conversion overlaps with fetching the rest of the result set
+            async with conn.transaction(readonly=True):
+                stmt = await conn.prepare(query)
+                # Column names are the same for every row, so look them up once
+                keys = tuple(attr.name for attr in stmt.get_attributes())
+                cursor = await stmt.cursor()
+                while True:
+                    rows = await cursor.fetch(FETCH_BATCH_SIZE)
+                    if not rows:
+                        break
+                    # PostgreSQL-specific types are already converted by the connection codecs
+                    result.extend(dict(zip(keys, row)) for row in rows)
         
-        logger.info(f"Executed query successfully, returned {len(result)} rows")
+        logger.info("Executed query successfully, returned %d rows", len(result))
         return {"rows": result}
     except Exception as e:
-        logger.error(f"Error executing query: {str(e)}")
+        logger.exception("Error executing query")
         return {"error": str(e)}
 
 @mcp.tool()
@@ -177,28 +226,32 @@ async def count_rows(
     condition: Annotated[str, Field(description="Optional WHERE condition")] = ""
 ) -> Dict[str, int]:
     """Count the number of rows in a table with an optional condition"""
-    if not postgres_operator:
+    if not postgres_operator or not postgres_operator.pool:
         return {"error": "Database connection not initialized"}
     
+    # The table name is quoted as an identifier, so only the condition can carry user SQL
+    if condition and _WRITE_RE.search(condition):
+        logger.warning("Rejected non-read-only count condition: %s", condition)
+        return {"error": "Only read-only queries are allowed"}
+    
     try:
-        conn = await postgres_operator.connect()
+        # Double any embedded quotes so every name list_tables returns is accepted
+        quoted_name = '"' + table_name.replace('"', '""') + '"'
+        query = f"SELECT COUNT(*) FROM {quoted_name}"
         
-        query = f"SELECT COUNT(*) FROM {table_name}"
         if condition:
             query += f" WHERE {condition}"
         
-        # For security, check if this is a read-only query
-        query_lower = query.lower().strip()
-        if any(keyword in query_lower for keyword in ['insert', 'update', 'delete', 'drop', 'alter', 'create', 'truncate']):
-            logger.warning(f"Rejected non-read-only count query: {query}")
-            return {"error": "Only read-only queries are allowed"}
-        
-        count = await conn.fetchval(query)
+        # asyncpg's per-connection statement cache reuses the plan for repeat counts
+        async with postgres_operator.pool.acquire() as conn:
+            # The condition is free-form SQL, so let PostgreSQL reject any writes
+            async with conn.transaction(readonly=True):
+                count = await conn.fetchval(query)
         
-        logger.info(f"Counted {count} rows in table {table_name}")
+        logger.info("Counted %d rows in table %s", count, table_name)
         return {"count": count}
     except Exception as e:
-        logger.error(f"Error counting rows in table {table_name}: {str(e)}")
+        logger.exception("Error counting rows in table %s", table_name)
         return {"error": str(e)}
 
 # Server initialization with connection string
@@ -210,10 +263,19 @@ if __name__ == "__main__":
     connection_string = sys.argv[1]
     postgres_operator = PostgresOperator(connection_string)
     
+    # asyncpg runs noticeably faster on uvloop, so use it when it is installed
+    try:
+        import uvloop
+        loop = uvloop.new_event_loop()
+    except ImportError:
+        loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    
     # Use asyncio to run the server
-    loop = asyncio.get_event_loop()
     try:
+        loop.run_until_complete(postgres_operator.start())
         loop.run_until_complete(mcp.run_async())
     finally:
         if postgres_operator:
             loop.run_until_complete(postgres_operator.close())
+        loop.close()
@@ -1,6 +1,9 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: MIT-0
-import boto3
+import aioboto3
+import asyncio
+from cachetools import TTLCache
+from contextlib import AsyncExitStack
 from fastmcp import FastMCP
 from typing import Annotated, List, Dict, Any, Optional
 from pydantic import Field
@@ -18,50 +21,94 @@ mcp = FastMCP("RDS Server")
 class RDSOperator:
     def __init__(self):
         # Initialize with default AWS configuration
-        self.session = boto3.Session()
+        self.session = aioboto3.Session()
+        # Clients are expensive to build, so keep one entered client per region
+        # ("" only when no default region is configured); close() exits them all
+        self._clients: Dict[str, Any] = {}
+        self._exit_stack = AsyncExitStack()
+        self._lock = asyncio.Lock()
+        # Engine version listings change rarely, so keep them for five minutes
+        self._engine_versions: TTLCache = TTLCache(maxsize=256, ttl=300)
         logger.info("RDS Operator initialized")
     
-    def get_client(self, region: str = ""):
-        """Get an RDS client for a specific region or default"""
-        if region:
-            logger.info(f"Creating RDS client for region: {region}")
-            return self.session.client('rds', region_name=region)
-        logger.info("Creating RDS client with default region")
-        return self.session.client('rds')
+    async def get_client(self, region: str = ""):
+        """Get a cached RDS client for a specific region or default"""
+        # Key on the actual region so the default client is reused when the
+        # session's own region is requested explicitly
+        region = region or self.session.region_name or ""
+        client = self._clients.get(region)
+        if client is None:
+            # Only one task should create and enter the client for a region
+            async with self._lock:
+                client = self._clients.get(region)
+                if client is None:
+                    if region:
+                        logger.info("Creating RDS client for region: %s", region)
+                        client_context = self.session.client('rds', region_name=region)
+                    else:
+                        logger.info("Creating RDS client with default region")
+                        client_context = self.session.client('rds')
+                    client = await self._exit_stack.enter_async_context(client_context)
+                    self._clients[region] = client
+        return client
+    
+    async def close(self):
+        """Close all cached RDS clients"""
+        logger.info("Closing RDS clients")
+        await self._exit_stack.aclose()
+        self._clients.clear()
+    
+    async def get_engine_versions(self, engine: str, region: str = "") -> List[Dict[str, Any]]:
+        """Get the versions of an engine, serving repeat lookups from the cache"""
+        versions = self._engine_versions.get((engine, region))
+        if versions is None:
+            client = await self.get_client(region)
+            paginator = client.get_paginator('describe_db_engine_versions')
+            
+            versions = []
+            async for page in paginator.paginate(Engine=engine):
+                versions.extend({
+                    "engine": version['Engine'],
+                    "version": version['EngineVersion'],
+                    "description": version.get('DBEngineVersionDescription', 'N/A'),
+                    "default_parameter_family": version.get('DBParameterGroupFamily', 'N/A'),
+                } for version in page['DBEngineVersions'])
+            self._engine_versions[(engine, region)] = versions
+        return versions
 
 rds_operator = RDSOperator()
 
 @mcp.tool()
-def list_db_instances(
+async def list_db_instances(
     region: Annotated[str, Field(description="AWS region (optional)")] = ""
 ) -> Dict[str, List[Dict[str, Any]]]:
     """List RDS instances in the specified region"""
-    client = rds_operator.get_client(region)
-    response = client.describe_db_instances()
+    client = await rds_operator.get_client(region)
+    paginator = client.get_paginator('describe_db_instances')
     
     instances = []
-    for instance in response['DBInstances']:
-        instances.append({
+    async for page in paginator.paginate():
+        instances.extend({
             "identifier": instance['DBInstanceIdentifier'],
             "engine": instance['Engine'],
             "status": instance['DBInstanceStatus'],
             "endpoint": instance.get('Endpoint', {}).get('Address', 'N/A'),
             "port": instance.get('Endpoint', {}).get('Port', 'N/A'),
-        })
+        } for instance in page['DBInstances'])
     
-    logger.info(f"Listed {len(instances)} RDS instances")
+    logger.info("Listed %d RDS instances", len(instances))
     return {"instances": instances}
 
 @mcp.tool()
-def describe_db_instance(
+async def describe_db_instance(
     instance_id: Annotated[str, Field(description="RDS instance identifier")],
     region: Annotated[str, Field(description="AWS region (optional)")] = ""
 ) -> Dict[str, Any]:
     """Get detailed information about an RDS instance"""
-    client = rds_operator.get_client(region)
+    client = await rds_operator.get_client(region)
     
     try:
-        response = client.describe_db_instances(DBInstanceIdentifier=instance_id)
+        response = await client.describe_db_instances(DBInstanceIdentifier=instance_id)
         
         if not response['DBInstances']:
             return {"error": f"No instance found with ID {instance_id}"}
@@ -84,37 +131,33 @@ def describe_db_instance(
             "vpc_id": instance.get('DBSubnetGroup', {}).get('VpcId', 'N/A'),
         }
         
-        logger.info(f"Retrieved details for RDS instance {instance_id}")
+        logger.info("Retrieved details for RDS instance %s", instance_id)
         return {"instance": result}
     
     except client.exceptions.DBInstanceNotFoundFault:
-        logger.error(f"RDS instance {instance_id} not found")
+        logger.error("RDS instance %s not found", instance_id)
         return {"error": f"Instance {instance_id} not found"}
     except Exception as e:
-        logger.error(f"Error describing RDS instance {instance_id}: {str(e)}")
+        logger.exception("Error describing RDS instance %s", instance_id)
         return {"error": str(e)}
 
 @mcp.tool()
-def list_db_engine_versions(
+async def list_db_engine_versions(
     engine: Annotated[str, Field(description="Database engine (e.g., mysql, postgres)")],
     region: Annotated[str, Field(description="AWS region (optional)")] = ""
 ) -> Dict[str, List[Dict[str, Any]]]:
     """List available engine versions for a specific database engine"""
-    client = rds_operator.get_client(region)
-    
-    response = client.describe_db_engine_versions(Engine=engine)
+    versions = await rds_operator.get_engine_versions(engine, region)
     
-    versions = []
-    for version in response['DBEngineVersions']:
-        versions.append({
-            "engine": version['Engine'],
-            "version": version['EngineVersion'],
-            "description": version.get('DBEngineVersionDescription', 'N/A'),
-            "default_parameter_family": version.get('DBParameterGroupFamily', 'N/A'),
-        })
-    
-    logger.info(f"Listed {len(versions)} engine versions for {engine}")
+    logger.info("Listed %d engine versions for %s", len(versions), engine)
     return {"versions": versions}
 
+async def main():
+    """Run the server and close the cached clients on shutdown"""
+    try:
+        await mcp.run_async()
+    finally:
+        await rds_operator.close()
+
 if __name__ == "__main__":
-    mcp.run()
+    asyncio.run(main())
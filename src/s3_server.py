@@ -1,6 +1,9 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: MIT-0
-import boto3
+import aioboto3
+import asyncio
+from cachetools import TTLCache
+from contextlib import AsyncExitStack
 from fastmcp import FastMCP
 from typing import Annotated, List, Dict, Any, Optional
 from pydantic import Field
@@ -18,70 +21,130 @@ mcp = FastMCP("S3 Server")
 class S3Operator:
     def __init__(self):
         # Initialize with default AWS configuration
-        self.session = boto3.Session()
+        self.session = aioboto3.Session()
+        # Clients are expensive to build, so keep one entered client per region;
+        # close() exits them all
+        self._clients: Dict[str, Any] = {}
+        self._exit_stack = AsyncExitStack()
+        self._lock = asyncio.Lock()
+        # Bucket regions rarely change, so remember them for an hour
+        self._locations: TTLCache = TTLCache(maxsize=4096, ttl=3600)
         logger.info("S3 Operator initialized")
     
-    def get_client(self, region: str = ""):
-        """Get an S3 client for a specific region or default"""
-        if region:
-            logger.info(f"Creating S3 client for region: {region}")
-            return self.session.client('s3', region_name=region)
-        logger.info("Creating S3 client with default region")
-        return self.session.client('s3')
+    async def get_client(self, region: str = ""):
+        """Get a cached S3 client for a specific region or default"""
+        # Key on the actual region so the default client is reused when a
+        # bucket resolves to the session's own region
+        region = region or self.session.region_name or 'us-east-1'
+        client = self._clients.get(region)
+        if client is None:
+            # Only one task should create and enter the client for a region
+            async with self._lock:
+                client = self._clients.get(region)
+                if client is None:
+                    logger.info("Creating S3 client for region: %s", region)
+                    client_context = self.session.client('s3', region_name=region)
+                    client = await self._exit_stack.enter_async_context(client_context)
+                    self._clients[region] = client
+        return client
+    
+    async def close(self):
+        """Close all cached S3 clients"""
+        logger.info("Closing S3 clients")
+        await self._exit_stack.aclose()
+        self._clients.clear()
+    
+    async def resolve_region(self, bucket: str) -> str:
+        """Get the region of a bucket, serving repeat lookups from the cache"""
+        location = self._locations.get(bucket)
+        if location is None:
+            client = await self.get_client()
+            response = await client.get_bucket_location(Bucket=bucket)
+            # S3 returns None for us-east-1, so handle that case
+            location = response.get('LocationConstraint') or 'us-east-1'
+            # Very old buckets report the legacy 'EU' constraint for eu-west-1
+            if location == 'EU':
+                location = 'eu-west-1'
+            self._locations[bucket] = location
+        return location
 
 s3_operator = S3Operator()
 
 @mcp.tool()
-def list_buckets(
+async def list_buckets(
     region: Annotated[str, Field(description="AWS region (optional)")] = ""
 ) -> Dict[str, List[str]]:
     """List S3 buckets in the specified region"""
-    client = s3_operator.get_client(region)
-    response = client.list_buckets()
+    client = await s3_operator.get_client(region)
+    response = await client.list_buckets()
     buckets = [bucket['Name'] for bucket in response['Buckets']]
-    logger.info(f"Listed {len(buckets)} buckets")
+    logger.info("Listed %d buckets", len(buckets))
     return {"buckets": buckets}
 
-@mcp.tool()
-def list_objects(
-    bucket: Annotated[str, Field(description="S3 bucket name")],
-    prefix: Annotated[str, Field(description="Object prefix (optional)")] = "",
-    region: Annotated[str, Field(description="AWS region (optional)")] = ""
-) -> Dict[str, List[Dict[str, Any]]]:
-    """List objects in an S3 bucket with optional prefix"""
-    client = s3_operator.get_client(region)
-    
+async def _list_objects(client, bucket: str, prefix: str, max_items: int) -> List[Dict[str, Any]]:
+    """Collect the objects under a prefix, following every page"""
     params = {'Bucket': bucket}
     if prefix:
         params['Prefix'] = prefix
+    if max_items > 0:
+        params['PaginationConfig'] = {'MaxItems': max_items}
     
-    response = client.list_objects_v2(**params)
+    # list_objects_v2 returns at most 1000 keys per call, so walk every page
+    paginator = client.get_paginator('list_objects_v2')
     
     objects = []
-    if 'Contents' in response:
-        for obj in response['Contents']:
-            objects.append({
-                'key': obj['Key'],
-                'size': obj['Size'],
-                'last_modified': obj['LastModified'].isoformat(),
-            })
+    async for page in paginator.paginate(**params):
+        objects.extend({
+            'key': obj['Key'],
+            'size': obj['Size'],
+            'last_modified': obj['LastModified'].isoformat(),
+        } for obj in page.get('Contents', ()))
+    return objects
+
+@mcp.tool()
+async def list_objects(
+    bucket: Annotated[str, Field(description="S3 bucket name")],
+    prefix: Annotated[str, Field(description="Object prefix (optional)")] = "",
+    region: Annotated[str, Field(description="AWS region (optional)")] = "",
+    max_items: Annotated[int, Field(description="Maximum number of objects to return (optional)")] = 0
+) -> Dict[str, List[Dict[str, Any]]]:
+    """List objects in an S3 bucket with optional prefix"""
+    client = await s3_operator.get_client(region)
+    objects = await _list_objects(client, bucket, prefix, max_items)
     
-    logger.info(f"Listed {len(objects)} objects in bucket {bucket}")
+    logger.info("Listed %d objects in bucket %s", len(objects), bucket)
     return {"objects": objects}
 
 @mcp.tool()
-def get_bucket_location(
+async def list_objects_smart(
+    bucket: Annotated[str, Field(description="S3 bucket name")],
+    prefix: Annotated[str, Field(description="Object prefix (optional)")] = "",
+    max_items: Annotated[int, Field(description="Maximum number of objects to return (optional)")] = 0
+) -> Dict[str, Any]:
+    """List objects in an S3 bucket using a client in the bucket's own region"""
+    region = await s3_operator.resolve_region(bucket)
+    client = await s3_operator.get_client(region)
+    objects = await _list_objects(client, bucket, prefix, max_items)
+    
+    logger.info("Listed %d objects in bucket %s (%s)", len(objects), bucket, region)
+    return {"region": region, "objects": objects}
+
+@mcp.tool()
+async def get_bucket_location(
     bucket: Annotated[str, Field(description="S3 bucket name")]
 ) -> Dict[str, str]:
     """Get the region where an S3 bucket is located"""
-    client = s3_operator.get_client()
-    response = client.get_bucket_location(Bucket=bucket)
+    location = await s3_operator.resolve_region(bucket)
     
-    # S3 returns None for us-east-1, so handle that case
-    location = response.get('LocationConstraint') or 'us-east-1'
-    
-    logger.info(f"Bucket {bucket} is located in {location}")
+    logger.info("Bucket %s is located in %s", bucket, location)
     return {"region": location}
 
+async def main():
+    """Run the server and close the cached clients on shutdown"""
+    try:
+        await mcp.run_async()
+    finally:
+        await s3_operator.close()
+
 if __name__ == "__main__":
-    mcp.run()
+    asyncio.run(main())